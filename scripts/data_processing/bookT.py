@@ -1,29 +1,108 @@
 import json
 from pathlib import Path
 
+import orjson
+
 # Define paths
 BASE_DIR = Path(__file__).parent
 CARDS_JSON = BASE_DIR / "data" / "cards.json"
 OUTPUT_JSON = BASE_DIR / "data" / "cards_ordered.json"
 
+# Placeholder Major Arcana names by number
+MAJOR_ARCANA_NAMES = {
+    "The 1": "The Magician",
+    "The 2": "The High Priestess",
+    "The 3": "The Empress",
+    "The 4": "The Emperor",
+    "The 5": "The Hierophant",
+    "The 6": "The Lovers",
+    "The 7": "The Chariot",
+    "The 8": "Strength",
+    "The 9": "The Hermit",
+    "The 10": "Wheel of Fortune",
+    "The 11": "Justice",
+    "The 12": "The Hanged Man",
+    "The 13": "Death",
+    "The 14": "Temperance",
+    "The 15": "The Devil",
+    "The 16": "The Tower",
+    "The 17": "The Star",
+    "The 18": "The Moon",
+    "The 19": "The Sun",
+    "The 20": "Judgement",
+    "The 21": "The World"
+}
+
+# Suit elements and the Book T lookup plan, built once at import
+ELEMENTS = {
+    "WANDS": "FIRE",
+    "CUPS": "WATER",
+    "SWORDS": "AIR",
+    "PENTACLES": "EARTH"
+}
+SUITS = ["WANDS", "CUPS", "SWORDS", "PENTACLES"]
+COURT_TITLES = ["Knight", "Queen", "King", "Princess"]
+PIP_SEQUENCE = [
+    (5,7,"WANDS"), (8,10,"PENTACLES"), (2,4,"SWORDS"),
+    (5,7,"CUPS"), (8,10,"WANDS"), (2,4,"PENTACLES"),
+    (5,7,"SWORDS"), (8,10,"CUPS"), (2,4,"WANDS"),
+    (5,7,"PENTACLES"), (8,10,"SWORDS"), (2,4,"CUPS")
+]
+
+def _build_book_t_plan():
+    plan = []
+    # 1. Aces
+    for suit in SUITS:
+        plan.append({"suit": suit, "number": 1, "element": ELEMENTS[suit]})
+    # 2. Court Cards
+    for suit in SUITS:
+        for title in COURT_TITLES:
+            plan.append({"suit": suit, "name": f"{title} of {suit.capitalize()}", "element": ELEMENTS[suit]})
+    # 3. Pip Cards in Book T sequence
+    for start, end, suit in PIP_SEQUENCE:
+        for num in range(start, end + 1):
+            plan.append({"suit": suit, "number": num, "element": ELEMENTS[suit]})
+    # 4. Major Arcana
+    for name in ["The Fool"] + [f"The {i}" for i in range(1, 22)]:
+        plan.append({"name": name})
+    return plan
+
+BOOK_T_PLAN = _build_book_t_plan()
+
 def load_cards(file_path):
     with open(file_path, 'r') as f:
         return json.load(f)
 
 def save_cards(cards, file_path):
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump({"cards": cards}, f, indent=2, ensure_ascii=False)
+    with open(file_path, 'wb') as f:
+        f.write(orjson.dumps({"cards": cards}, option=orjson.OPT_INDENT_2))
 
-def get_card_by_criteria(cards, suit=None, number=None, name=None):
+def index_cards(cards):
+    """Build name and (suit, number) lookup tables in a single pass.
+
+    Lookups are exact. The linear scan this replaced treated a missing
+    suit/number key as a wildcard, so on an incomplete deck any card without
+    those keys (e.g. a Major Arcana) filled every pip slot after a gap;
+    missing cards now get placeholders instead.
+    """
+    by_name = {}
+    by_suit_num = {}
     for card in cards:
-        if suit and 'suit' in card and card['suit'] != suit:
-            continue
-        if number is not None and 'number' in card and card['number'] != number:
-            continue
-        if name and 'name' in card and card['name'] != name:
-            continue
+        # setdefault keeps the first card when names or (suit, number) repeat
+        if 'name' in card:
+            by_name.setdefault(card['name'], card)
+        if 'suit' in card and card.get('number') is not None:
+            by_suit_num.setdefault((card['suit'], card['number']), card)
+    return by_name, by_suit_num
+
+def get_card_by_criteria(index, suit=None, number=None, name=None):
+    by_name, by_suit_num = index
+    if name:
+        card = by_name.get(name)
+        if card and suit and card.get('suit', suit) != suit:
+            return None
         return card
-    return None
+    return by_suit_num.get((suit, number))
 
 def create_placeholder_card(number, suit=None, name=None, element=None):
     card = {
@@ -33,14 +112,15 @@ def create_placeholder_card(number, suit=None, name=None, element=None):
     }
     
     if suit:
+        suit_title = suit.capitalize()
         # Fix court card naming
         if name and "of" in name:
-            name = name.replace(f"of {suit.capitalize()} of {suit.capitalize()}", f"of {suit.capitalize()}")
+            name = name.replace(f"of {suit_title} of {suit_title}", f"of {suit_title}")
         
         card.update({
             "number": number,
             "suit": suit,
-            "name": name or f"{number} of {suit.capitalize()}",
+            "name": name or f"{number} of {suit_title}",
             "element": element,
             "astrological": "TBD",
             "kabbalistic": "TBD",
@@ -48,32 +128,7 @@ def create_placeholder_card(number, suit=None, name=None, element=None):
         })
     else:
         # Handle Major Arcana naming
-        major_arcana_names = {
-            "The 1": "The Magician",
-            "The 2": "The High Priestess",
-            "The 3": "The Empress",
-            "The 4": "The Emperor",
-            "The 5": "The Hierophant",
-            "The 6": "The Lovers",
-            "The 7": "The Chariot",
-            "The 8": "Strength",
-            "The 9": "The Hermit",
-            "The 10": "Wheel of Fortune",
-            "The 11": "Justice",
-            "The 12": "The Hanged Man",
-            "The 13": "Death",
-            "The 14": "Temperance",
-            "The 15": "The Devil",
-            "The 16": "The Tower",
-            "The 17": "The Star",
-            "The 18": "The Moon",
-            "The 19": "The Sun",
-            "The 20": "Judgement",
-            "The 21": "The World"
-        }
-        
-        if name in major_arcana_names:
-            name = major_arcana_names[name]
+        name = MAJOR_ARCANA_NAMES.get(name, name)
             
         card.update({
             "name": name,
@@ -84,55 +139,16 @@ def create_placeholder_card(number, suit=None, name=None, element=None):
     
     return card
 
-def get_or_create_card(cards, suit=None, number=None, name=None, element=None):
-    card = get_card_by_criteria(cards, suit, number, name)
+def get_or_create_card(index, suit=None, number=None, name=None, element=None):
+    card = get_card_by_criteria(index, suit, number, name)
     if not card:
         card = create_placeholder_card(number, suit, name, element)
         print(f"Created placeholder for: {card['name']}")
     return card
 
 def reorder_cards(cards):
-    ordered_cards = []
-    elements = {
-        "WANDS": "FIRE",
-        "CUPS": "WATER",
-        "SWORDS": "AIR",
-        "PENTACLES": "EARTH"
-    }
-    
-    # 1. Aces
-    suits = ["WANDS", "CUPS", "SWORDS", "PENTACLES"]
-    for suit in suits:
-        ace = get_or_create_card(cards, suit=suit, number=1, element=elements[suit])
-        ordered_cards.append(ace)
-    
-    # 2. Court Cards
-    court_titles = ["Knight", "Queen", "King", "Princess"]
-    for suit in suits:
-        for title in court_titles:
-            court_card = get_or_create_card(cards, suit=suit, name=f"{title} of {suit.capitalize()}", element=elements[suit])
-            ordered_cards.append(court_card)
-    
-    # 3. Pip Cards in Book T sequence
-    pip_sequence = [
-        (5,7,"WANDS"), (8,10,"PENTACLES"), (2,4,"SWORDS"),
-        (5,7,"CUPS"), (8,10,"WANDS"), (2,4,"PENTACLES"),
-        (5,7,"SWORDS"), (8,10,"CUPS"), (2,4,"WANDS"),
-        (5,7,"PENTACLES"), (8,10,"SWORDS"), (2,4,"CUPS")
-    ]
-    
-    for start, end, suit in pip_sequence:
-        for num in range(start, end + 1):
-            card = get_or_create_card(cards, suit=suit, number=num, element=elements[suit])
-            ordered_cards.append(card)
-    
-    # 4. Major Arcana
-    major_sequence = ["The Fool"] + [f"The {i}" for i in range(1, 22)]
-    for name in major_sequence:
-        major = get_or_create_card(cards, name=name)
-        ordered_cards.append(major)
-    
-    return ordered_cards
+    index = index_cards(cards)
+    return [get_or_create_card(index, **spec) for spec in BOOK_T_PLAN]
 
 def main():
     try:
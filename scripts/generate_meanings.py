@@ -1,8 +1,10 @@
-import json
 import asyncio
+from datetime import date
 from pathlib import Path
+import orjson
 from tarotai.extensions.enrichment.clients import DeepSeekClient, VoyageClient
-from typing import Dict, Any, List
+from tarotai.extensions.enrichment.embedding_cache import EmbeddingCache
+from typing import BinaryIO, Dict, Any, List, Optional
 
 SYSTEM_ROLE = """
 You are an expert tarot interpreter with deep knowledge of:
@@ -20,40 +22,38 @@ INSTRUCTIONS = """
 """
 
 FORMAT = """
-Provide output as plain text with:
+Write each meaning as a single plain-text string (not a list or object) with:
 - 2-3 sentence meaning
 - 1-2 practical applications
 - 1 psychological insight
 """
 
-UPRIGHT_PROMPT = """
-{ROLE_CONTEXT}
-{INSTRUCTIONS}
-{FORMAT}
-
-Generate an upright meaning for:
+MEANINGS_PROMPT = """
+Generate tarot meanings for:
 - Card: {card_name}
 - Element: {element}
 - Keywords: {keywords}
 - Astrological: {astrological}
 - Kabbalistic: {kabbalistic}
-"""
-
-REVERSED_PROMPT = """
-{ROLE_CONTEXT}
-{INSTRUCTIONS}
-{FORMAT}
-
-Generate a reversed meaning for:
-- Card: {card_name}
-- Upright Meaning: {upright_meaning}
-
-Consider:
+{upright_context}
+For the reversed meaning, consider:
 1. How the energy is blocked or distorted
 2. Potential shadow aspects
 3. Opportunities for growth
+
+Respond with a JSON object containing exactly these keys:
+{fields}
 """
 
+# JSON keys the combined prompt can request, with the value each should hold
+MEANING_FIELDS = {
+    "upright_meaning": "the upright meaning as a single string",
+    "reversed_meaning": "the reversed meaning as a single string"
+}
+
+# Existing upright meaning, given so the reversed meaning can build on it
+UPRIGHT_CONTEXT = "- Upright meaning: {upright_meaning}\n"
+
 ERROR_HANDLING = """
 If unsure about interpretation:
 1. Focus on core card symbolism
@@ -61,71 +61,192 @@ If unsure about interpretation:
 3. Suggest further research areas
 """
 
+CARDS_FILE = Path("data/cards_ordered.json")
+# Cards are appended here, embeddings included, as they finish so an
+# interrupted run can resume
+CHECKPOINT_FILE = Path("data/cards_ordered.jsonl")
+
+# Card-independent instructions, sent verbatim as the system turn of every
+# request so DeepSeek's prefix cache can reuse them across cards
+STATIC_PREFIX = "\n\n".join(
+    section.strip() for section in (SYSTEM_ROLE, INSTRUCTIONS, FORMAT, ERROR_HANDLING)
+)
+
+def is_valid_meaning(value: Any) -> bool:
+    """Check a generated meaning is the non-empty string CardMeaning expects."""
+    return isinstance(value, str) and bool(value.strip())
+
 async def generate_meanings(card: Dict[str, Any], ai_client: DeepSeekClient) -> Dict[str, Any]:
-    """Generate upright and reversed meanings for a card."""
-    # Prepare context variables
-    context = {
-        "ROLE_CONTEXT": SYSTEM_ROLE,
-        "INSTRUCTIONS": INSTRUCTIONS,
-        "FORMAT": FORMAT,
-        **card
-    }
-    
-    if not card.get("upright_meaning"):
-        prompt = UPRIGHT_PROMPT.format(**context)
-        card["upright_meaning"] = await ai_client.generate_response(prompt)
-    
-    if not card.get("reversed_meaning"):
-        prompt = REVERSED_PROMPT.format(**context)
-        card["reversed_meaning"] = await ai_client.generate_response(prompt)
-    
-    return card
+    """Generate any missing upright and reversed meanings for a card in a single request."""
+    missing = [field for field in MEANING_FIELDS if not card.get(field)]
+    if not missing:
+        return card
 
-async def generate_embeddings(card: Dict[str, Any], voyage_client: VoyageClient) -> Dict[str, Any]:
-    """Generate embeddings for a card's meanings."""
-    if not card.get("embeddings"):
-        card["embeddings"] = {}
-    
-    if not card["embeddings"].get("upright"):
-        card["embeddings"]["upright"] = await voyage_client.generate_embedding(card["upright_meaning"])
-    
-    if not card["embeddings"].get("reversed"):
-        card["embeddings"]["reversed"] = await voyage_client.generate_embedding(card["reversed_meaning"])
-    
+    prompt = MEANINGS_PROMPT.format(
+        card_name=card.get("name"),
+        element=card.get("element"),
+        keywords=", ".join(card.get("keywords") or []),
+        astrological=card.get("astrological"),
+        kabbalistic=card.get("kabbalistic"),
+        upright_context=(
+            UPRIGHT_CONTEXT.format(upright_meaning=card["upright_meaning"])
+            if card.get("upright_meaning") else ""
+        ),
+        fields="\n".join(f'- "{field}": {MEANING_FIELDS[field]}' for field in missing)
+    )
+    result = await ai_client.json_prompt(prompt.strip(), system_prompt=STATIC_PREFIX)
+    # Leave malformed fields missing so the next run asks for them again
+    card.update({field: result[field] for field in missing if is_valid_meaning(result.get(field))})
     return card
 
-async def process_cards(cards: List[Dict[str, Any]], ai_client: DeepSeekClient, voyage_client: VoyageClient) -> List[Dict[str, Any]]:
-    """Process all cards to generate meanings and embeddings."""
-    processed_cards = []
+def has_embedding(vector: Any) -> bool:
+    """Check whether an embedding is real rather than missing or an all-zero placeholder."""
+    # any() stops at the first non-zero value, so real vectors exit almost immediately
+    return bool(vector) and any(vector)
+
+async def generate_all_embeddings(cards: List[Dict[str, Any]], voyage_client: VoyageClient) -> List[Dict[str, Any]]:
+    """Generate all missing meaning embeddings for the deck in batched requests."""
+    pending = []
     for card in cards:
+        if not card.get("embeddings"):
+            card["embeddings"] = {}
+        embeddings = card["embeddings"]
+        for orientation in ("upright", "reversed"):
+            text = card.get(f"{orientation}_meaning")
+            if text and not has_embedding(embeddings.get(orientation)):
+                pending.append((card, orientation, text))
+
+    if not pending:
+        return cards
+
+    try:
+        vectors = await voyage_client.generate_embeddings([text for _, _, text in pending])
+    except Exception as e:
+        print(f"Error generating embeddings: {str(e)}")
+        return cards
+
+    for (card, orientation, _), vector in zip(pending, vectors):
+        card["embeddings"][orientation] = vector
+    return cards
+
+async def process_cards(
+    cards: List[Dict[str, Any]],
+    ai_client: DeepSeekClient,
+    voyage_client: VoyageClient,
+    max_concurrency: int = 10,
+    checkpoint_file: Optional[Path] = None,
+    embedding_batch_size: int = 16
+) -> List[Dict[str, Any]]:
+    """Process all cards to generate meanings and embeddings.
+
+    Meanings are generated concurrently, with at most ``max_concurrency``
+    requests in flight so the DeepSeek rate limit is respected. As cards
+    finish, they are embedded in groups of ``embedding_batch_size`` so
+    Voyage requests overlap with the remaining DeepSeek calls. If
+    ``checkpoint_file`` is given, each group is appended to it as JSON lines
+    once its embeddings are done, so a resumed run needs neither call again.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    checkpoint = open_checkpoint(checkpoint_file) if checkpoint_file else None
+
+    async def process_card(card: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                card = await generate_meanings(card, ai_client)
+            except Exception as e:
+                print(f"Error processing card {card.get('name')}: {str(e)}")
+            return card  # Keep the original card data on failure
+
+    async def embed_group(group: List[Dict[str, Any]]) -> None:
+        await generate_all_embeddings(group, voyage_client)
+        if checkpoint:
+            checkpoint.write(b"".join(orjson.dumps(card) + b"\n" for card in group))
+            checkpoint.flush()
+
+    meaning_tasks = [asyncio.create_task(process_card(card)) for card in cards]
+    embedding_tasks = []
+    ready: List[Dict[str, Any]] = []
+    try:
+        for finished in asyncio.as_completed(meaning_tasks):
+            ready.append(await finished)
+            if len(ready) >= embedding_batch_size:
+                embedding_tasks.append(asyncio.create_task(embed_group(ready)))
+                ready = []
+        if ready:
+            embedding_tasks.append(asyncio.create_task(embed_group(ready)))
+        await asyncio.gather(*embedding_tasks)
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+    # Embeddings are written into the card dicts in place; keep the input order
+    return [task.result() for task in meaning_tasks]
+
+def open_checkpoint(file_path: Path) -> BinaryIO:
+    """Open the checkpoint for appending, dropping a partial last line left by an interruption."""
+    if file_path.exists():
+        data = file_path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            # Otherwise the next line would be appended onto the partial one
+            with open(file_path, "r+b") as f:
+                f.truncate(end)
+    return open(file_path, "ab")
+
+def resume_from_checkpoint(cards: List[Dict[str, Any]], file_path: Path) -> List[Dict[str, Any]]:
+    """Merge cards saved by an interrupted run into the loaded deck."""
+    saved = load_checkpoint(file_path)
+    for card in cards:
+        card.update(saved.get(card["name"], {}))
+    return cards
+
+def load_checkpoint(file_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load cards saved by an interrupted run, keyed by card name."""
+    if not file_path.exists():
+        return {}
+    saved = {}
+    for line in file_path.read_bytes().splitlines():
         try:
-            card = await generate_meanings(card, ai_client)
-            card = await generate_embeddings(card, voyage_client)
-            processed_cards.append(card)
-        except Exception as e:
-            print(f"Error processing card {card.get('name')}: {str(e)}")
-            processed_cards.append(card)  # Keep the original card data
-    return processed_cards
-
-def save_cards(cards: List[Dict[str, Any]], file_path: str) -> None:
-    """Save processed cards to a JSON file."""
-    with open(file_path, "w") as f:
-        json.dump({"cards": cards}, f, indent=2)
+            card = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue  # Skip a line cut short by the interruption
+        saved[card["name"]] = card
+    return saved
+
+def save_cards(cards: List[Dict[str, Any]], file_path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Save processed cards, plus any top-level metadata, to a JSON file."""
+    # orjson encodes the embedding float arrays in C, far faster than json.dump
+    data = {**(metadata or {}), "cards": cards}
+    Path(file_path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 async def main():
-    # Load existing cards
-    with open("data/cards_ordered.json") as f:
-        cards = json.load(f)["cards"]
+    # One timestamp for the whole run
+    run_date = date.today().isoformat()
+    
+    # Load existing cards, keeping the file's version metadata
+    with open(CARDS_FILE, "rb") as f:
+        metadata = orjson.loads(f.read())
+    cards = metadata.pop("cards")
     
-    # Initialize AI clients
-    ai_client = DeepSeekClient()
-    voyage_client = VoyageClient()
+    # Resume from an interrupted run; the skip-if-present checks reuse its work
+    cards = resume_from_checkpoint(cards, CHECKPOINT_FILE)
     
-    # Process cards
-    processed_cards = await process_cards(cards, ai_client, voyage_client)
+    # Initialize AI clients; each keeps one connection pool for the whole run
+    embedding_cache = EmbeddingCache()
+    try:
+        async with DeepSeekClient() as ai_client, VoyageClient(cache=embedding_cache) as voyage_client:
+            # Process cards
+            processed_cards = await process_cards(
+                cards, ai_client, voyage_client, checkpoint_file=CHECKPOINT_FILE
+            )
+    finally:
+        embedding_cache.close()
     
-    # Save updated cards
-    save_cards(processed_cards, "data/cards_ordered.json")
+    # Save updated cards and drop the checkpoint now the run has finished
+    metadata["last_updated"] = run_date
+    # Encoding and writing the whole deck is the largest blocking step; keep it off the loop
+    await asyncio.to_thread(save_cards, processed_cards, CARDS_FILE, metadata)
+    CHECKPOINT_FILE.unlink(missing_ok=True)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -24,8 +24,9 @@ setup(
         "realtimetts[system]==0.4.40",
         "elevenlabs>=1.50.3,<2.0.0",
         "pyttsx3>=2.98,<3.0.0",
-        "PyPDF2>=3.0.0,<4.0.0",
+        "pypdf>=3.9.0,<7.0.0",
         "httpx>=0.25.0,<1.0.0",
+        "orjson>=3.8.0,<4.0.0",
         "uv>=0.1.0,<1.0.0"
     ],
     extras_require={
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic import BaseSettings, Field, validator
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -36,8 +37,12 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
         env_nested_delimiter = "__"
 
+@lru_cache(maxsize=1)
 def get_config() -> Settings:
-    """Get application configuration"""
+    """Get application configuration, loaded once per process.
+
+    Call get_config.cache_clear() to reload after the environment changes.
+    """
     try:
         return Settings()
     except Exception as e:
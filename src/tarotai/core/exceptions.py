@@ -1,8 +1,9 @@
-from pydantic import BaseModel
-
-class TarotError(BaseModel):
-    message: str
-    code: int
+class TarotError(Exception):
+    """Base error raised by the enrichment pipeline"""
+    def __init__(self, message: str, code: int = 0):
+        super().__init__(message)
+        self.message = message
+        self.code = code
 
 class EnrichmentError(TarotError):
     """Error during card enrichment"""
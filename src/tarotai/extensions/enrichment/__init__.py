@@ -1,12 +1,14 @@
 # src/tarotai/extensions/enrichment/__init__.py
 from .enricher import TarotEnricher
 from .reading_history import ReadingHistoryManager
+from .embedding_cache import EmbeddingCache
 from .clients import DeepSeekClient, VoyageClient, ClaudeClient
 from .analyzers import TemporalAnalyzer, CombinationAnalyzer, InsightGenerator
 
 __all__ = [
     'TarotEnricher',
     'ReadingHistoryManager',
+    'EmbeddingCache',
     'DeepSeekClient', 
     'VoyageClient',
     'ClaudeClient',
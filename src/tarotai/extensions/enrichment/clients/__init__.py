@@ -0,0 +1,10 @@
+# src/tarotai/extensions/enrichment/clients/__init__.py
+from .base import BaseAIClient
+from .deepseek import DeepSeekClient
+from .voyage import VoyageClient
+
+__all__ = [
+    'BaseAIClient',
+    'DeepSeekClient',
+    'VoyageClient'
+]
@@ -3,6 +3,16 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 
 class BaseAIClient(ABC):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Release any network resources held by the client."""
+        pass
+
     @abstractmethod
     async def generate_response(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate a response from the AI model."""
@@ -14,7 +24,7 @@ class BaseAIClient(ABC):
         pass
 
     @abstractmethod
-    async def json_prompt(self, prompt: str) -> Dict[str, Any]:
+    async def json_prompt(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate a JSON response from the AI model."""
         pass
 
@@ -3,8 +3,8 @@ import json
 from typing import Dict, Any, Optional, List
 import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
-from ..exceptions import EnrichmentError
+from openai import AsyncOpenAI
+from tarotai.core.exceptions import EnrichmentError
 from .base import BaseAIClient
 
 load_dotenv()
@@ -17,16 +17,20 @@ class DeepSeekClient(BaseAIClient):
         if not self.api_key:
             raise EnrichmentError("DeepSeek API key not found in environment variables.")
         
-        self.client = OpenAI(
+        self.client = AsyncOpenAI(
             api_key=self.api_key,
             base_url="https://api.deepseek.com/v1"
         )
         self.model = "deepseek-chat"
 
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.client.close()
+
     async def generate_response(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate a response from DeepSeek Chat."""
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 **kwargs
@@ -35,12 +39,15 @@ class DeepSeekClient(BaseAIClient):
         except Exception as e:
             raise EnrichmentError(f"DeepSeek API request failed: {str(e)}")
 
-    async def json_prompt(self, prompt: str) -> Dict[str, Any]:
+    async def json_prompt(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate a JSON response from DeepSeek."""
         try:
-            response = self.client.chat.completions.create(
+            messages = [{"role": "user", "content": prompt}]
+            if system_prompt:
+                messages.insert(0, {"role": "system", "content": system_prompt})
+            response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
                 response_format={"type": "json_object"}
             )
             return json.loads(response.choices[0].message.content)
@@ -59,7 +66,7 @@ class DeepSeekClient(BaseAIClient):
                 {"role": "user", "content": prompt},
                 {"role": "assistant", "content": prefix, "prefix": True},
             ]
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages
             )
@@ -80,7 +87,7 @@ class DeepSeekClient(BaseAIClient):
                 {"role": "system", "content": system_prompt},
                 *messages,
             ]
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages
             )
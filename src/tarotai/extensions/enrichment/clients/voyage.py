@@ -1,8 +1,10 @@
+import asyncio
 import os
 from typing import Dict, Any, List, Optional
 import httpx
 from dotenv import load_dotenv
-from ..exceptions import EnrichmentError
+from tarotai.core.exceptions import EnrichmentError
+from ..embedding_cache import EmbeddingCache, lookup_cached, merge_fetched
 from .base import BaseAIClient
 
 load_dotenv()
@@ -10,7 +12,7 @@ load_dotenv()
 class VoyageClient(BaseAIClient):
     """Client for interacting with Voyage AI's embedding API."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[EmbeddingCache] = None):
         self.api_key = api_key or os.getenv("VOYAGE_API_KEY")
         if not self.api_key:
             raise EnrichmentError("Voyage API key not found in environment variables.")
@@ -18,46 +20,128 @@ class VoyageClient(BaseAIClient):
         self.base_url = "https://api.voyageai.com/v1"
         self.model = "voyage-01"
         self.embedding_dim = 1024
+        self.cache = cache
+        # One pooled client for the lifetime of this object so requests reuse
+        # TCP/TLS connections instead of handshaking each time
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.http_client.aclose()
 
     async def generate_response(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate a response from Voyage AI."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/generate",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    json={"prompt": prompt, **kwargs}
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.http_client.post(
+                f"{self.base_url}/generate",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json={"prompt": prompt, **kwargs}
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             raise EnrichmentError(f"Voyage API request failed: {str(e)}")
 
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embeddings for the given text."""
+        if self.cache is not None:
+            cached = self.cache.get(self.model, text)
+            if cached is not None:
+                return cached
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/embeddings",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    json={
-                        "model": self.model,
-                        "input": text
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data["data"][0]["embedding"]
+            response = await self.http_client.post(
+                f"{self.base_url}/embeddings",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json={
+                    "model": self.model,
+                    "input": text
+                }
+            )
+            response.raise_for_status()
+            data = response.json()
+            embedding = data["data"][0]["embedding"]
         except Exception as e:
             raise EnrichmentError(f"Voyage embedding request failed: {str(e)}")
+        if self.cache is not None:
+            self.cache.put(self.model, text, embedding)
+        return embedding
+
+    @staticmethod
+    def _plan_batches(texts: List[str], batch_size: int, max_batch_tokens: int) -> List[List[int]]:
+        """Group text indices into length-sorted batches within the input and token limits.
+
+        Tokens are estimated as len(text) // 4. Sorting by length keeps similar
+        sized inputs together so each request packs close to the budget.
+        """
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        batch_tokens = 0
+        for i in sorted(range(len(texts)), key=lambda i: len(texts[i])):
+            tokens = len(texts[i]) // 4 + 1
+            if batch and (len(batch) >= batch_size or batch_tokens + tokens > max_batch_tokens):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(i)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        batch_size: int = 128,
+        max_batch_tokens: int = 120_000,
+        max_concurrent_requests: int = 4
+    ) -> List[List[float]]:
+        """Generate embeddings for many texts in as few requests as possible.
+
+        Texts already in the cache are served from it; only misses are sent,
+        once per distinct text, packed into batches of at most batch_size
+        inputs and roughly max_batch_tokens tokens. Up to
+        max_concurrent_requests batches are in flight at once. Results are
+        returned in input order.
+        """
+        cached, missing_texts = lookup_cached(self.cache, self.model, texts)
+        fetched: List[Optional[List[float]]] = [None] * len(missing_texts)
+        if missing_texts:
+            semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+            async def embed_batch(batch: List[int]) -> None:
+                async with semaphore:
+                    response = await self.http_client.post(
+                        f"{self.base_url}/embeddings",
+                        headers={"Authorization": f"Bearer {self.api_key}"},
+                        json={
+                            "model": self.model,
+                            "input": [missing_texts[i] for i in batch]
+                        }
+                    )
+                response.raise_for_status()
+                # Map each result back to its position through the batch permutation
+                for item in response.json()["data"]:
+                    fetched[batch[item["index"]]] = item["embedding"]
 
-    async def json_prompt(self, prompt: str) -> Dict[str, Any]:
+            try:
+                await asyncio.gather(*[
+                    embed_batch(batch)
+                    for batch in self._plan_batches(missing_texts, batch_size, max_batch_tokens)
+                ])
+            except Exception as e:
+                raise EnrichmentError(f"Voyage batch embedding request failed: {str(e)}")
+
+        # Rejects any input the API skipped before caching anything
+        return merge_fetched(self.cache, self.model, texts, cached, missing_texts, fetched)
+
+    async def json_prompt(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate a JSON response from Voyage AI."""
         try:
-            response = await self.generate_response(
-                prompt,
-                response_format={"type": "json_object"}
-            )
+            kwargs: Dict[str, Any] = {"response_format": {"type": "json_object"}}
+            if system_prompt:
+                kwargs["system_prompt"] = system_prompt
+            response = await self.generate_response(prompt, **kwargs)
             return response["choices"][0]["message"]["content"]
         except Exception as e:
             raise EnrichmentError(f"Voyage JSON request failed: {str(e)}")
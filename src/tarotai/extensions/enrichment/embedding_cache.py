@@ -0,0 +1,142 @@
+# embedding_cache.py
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from tarotai.core.exceptions import EnrichmentError
+
+class EmbeddingCache:
+    """Content-addressed on-disk cache of text embeddings.
+
+    Entries are keyed by SHA-256 of the model name and text, so a model swap
+    never returns stale vectors. Vectors are stored as packed float32. Once
+    the cache holds more than max_entries vectors, the least recently used
+    ones are evicted. Recency is a sequence number that grows with every read
+    or write, so it never depends on the wall clock.
+
+    The cache may be used from worker threads (e.g. via asyncio.to_thread);
+    a lock serializes access to the shared connection.
+    """
+
+    def __init__(
+        self,
+        cache_file: Path = Path("data/knowledge_cache/embeddings.db"),
+        max_entries: int = 100_000
+    ):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.commit()
+
+    # Next value of the access sequence; each statement sees the previous one's write
+    _NEXT_ACCESS = "(SELECT COALESCE(MAX(last_access), 0) + 1 FROM embeddings)"
+
+    @staticmethod
+    def _key(model: str, text: str) -> str:
+        """Build the cache key for a model/text pair."""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for text, or None on a miss."""
+        return self.get_many(model, [text])[0]
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Return cached embeddings in input order, with None for misses."""
+        keys = [self._key(model, text) for text in texts]
+        found = {}
+        with self._lock:
+            # dict.fromkeys dedupes in input order, so recency follows the request order
+            for key in dict.fromkeys(keys):
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    found[key] = array("f", row[0]).tolist()
+            if found:
+                with self._conn:
+                    self._conn.executemany(
+                        f"UPDATE embeddings SET last_access = {self._NEXT_ACCESS} WHERE key = ?",
+                        [(key,) for key in found]
+                    )
+        return [found.get(key) for key in keys]
+
+    def put(self, model: str, text: str, vector: Sequence[float]) -> None:
+        """Store an embedding for text."""
+        self.put_many(model, [text], [vector])
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store embeddings for several texts in one transaction, evicting the
+        least recently used entries if the cache grows past max_entries."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_access) "
+                f"VALUES (?, ?, {self._NEXT_ACCESS})",
+                [
+                    (self._key(model, text), array("f", vector).tobytes())
+                    for text, vector in zip(texts, vectors)
+                ]
+            )
+            excess = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_access, rowid LIMIT ?)",
+                    (excess,)
+                )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+def lookup_cached(
+    cache: Optional[EmbeddingCache], model: str, texts: Sequence[str]
+) -> Tuple[List[Optional[List[float]]], List[str]]:
+    """Split texts into cached embeddings (None for misses) and the distinct
+    texts that still need fetching, in first-seen order."""
+    cached: List[Optional[List[float]]] = (
+        cache.get_many(model, texts) if cache is not None else [None] * len(texts)
+    )
+    # Identical texts (e.g. shared short meanings) only need embedding once
+    missing_texts = list(dict.fromkeys(
+        text for text, vector in zip(texts, cached) if vector is None
+    ))
+    return cached, missing_texts
+
+def merge_fetched(
+    cache: Optional[EmbeddingCache],
+    model: str,
+    texts: Sequence[str],
+    cached: Sequence[Optional[List[float]]],
+    missing_texts: Sequence[str],
+    fetched: Sequence[Optional[List[float]]]
+) -> List[List[float]]:
+    """Cache freshly fetched embeddings and stitch them into input order.
+
+    fetched must hold one vector per missing text; anything else raises
+    EnrichmentError before the cache is touched, so a short response can
+    never store vectors against the wrong texts.
+    """
+    if len(fetched) != len(missing_texts):
+        raise EnrichmentError(
+            f"Expected {len(missing_texts)} embeddings, got {len(fetched)}"
+        )
+    by_text: Dict[str, List[float]] = {}
+    for text, vector in zip(missing_texts, fetched):
+        if vector is None:
+            raise EnrichmentError(f"No embedding returned for input {text[:40]!r}")
+        by_text[text] = vector
+    if cache is not None and by_text:
+        cache.put_many(model, list(by_text), list(by_text.values()))
+    return [vector if vector is not None else by_text[text] for text, vector in zip(texts, cached)]
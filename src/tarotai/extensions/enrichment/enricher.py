@@ -33,7 +33,8 @@ class TarotEnricher:
         self.reading_manager = ReadingHistoryManager()
         self.embeddings_file = Path("data/embeddings.json")
         
-        # Initialize AI client
+        # Initialize AI client; only a client created here is closed by aclose()
+        self._owns_ai_client = ai_client is None
         if ai_client is None:
             self.ai_client = DeepSeekClient(api_key=os.getenv("DEEPSEEK_API_KEY"))
         else:
@@ -52,6 +53,19 @@ class TarotEnricher:
             "/home/fuar/projects/TarotAI/data/I.Regardie_Complete_Golden_Dawn_(II ed.deluxe).pdf"
         )
 
+    async def __aenter__(self) -> "TarotEnricher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the AI clients' connection pools and the embedding cache."""
+        if self._owns_ai_client:
+            await self.ai_client.aclose()
+        await self.voyage.aclose()
+        self.golden_dawn.embedding_cache.close()
+
     def _load_cards(self) -> List[CardMeaning]:
         """Load cards from JSON file and validate against CardMeaning model."""
         try:
@@ -219,11 +233,14 @@ class TarotEnricher:
             # Additional enrichment from reading history
             reading_insights = await self.learn_from_readings(card.name)
             
-            # Get Golden Dawn context
-            card_embedding = await self.voyage.generate_embedding(
-                f"{card.name} {' '.join(card.keywords)}"
+            # Get Golden Dawn context; the query must use the knowledge base's
+            # embedding model, and both calls block, so run them off the loop
+            card_embedding = await asyncio.to_thread(
+                self.golden_dawn.embed_query, f"{card.name} {' '.join(card.keywords)}"
+            )
+            relevant_sections = await asyncio.to_thread(
+                self.golden_dawn.find_relevant_sections, card_embedding
             )
-            relevant_sections = self.golden_dawn.find_relevant_sections(card_embedding)
             context = "\n\n".join(
                 f"Page {s['metadata']['page']}:\n{s['content']}" 
                 for s in relevant_sections
@@ -241,31 +258,37 @@ class TarotEnricher:
         except Exception as e:
             raise EnrichmentError(f"Failed to enrich card: {str(e)}")
 
-    async def process_all_cards(self) -> None:
-        """Process all cards with both enrichment and embeddings."""
+    async def process_all_cards(self, max_concurrency: int = 10) -> None:
+        """Process all cards with both enrichment and embeddings.
+
+        Cards are processed concurrently, with at most ``max_concurrency``
+        in flight to stay within provider rate limits.
+        """
         embeddings = {}
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def process_card(idx: int, card: CardMeaning) -> None:
+            async with semaphore:
+                try:
+                    print(f"Processing {card.name}...")
+                    enriched_card = await self.enrich_card(card)
+                    embedding = await self.generate_embeddings(enriched_card)
+                    embeddings[card.name] = embedding
+                    
+                    # Update card in list
+                    self.cards[idx] = enriched_card
+                    
+                except Exception as e:
+                    print(f"Error processing {card.name}: {str(e)}")
         
-        for card in self.cards:
-            try:
-                print(f"Processing {card.name}...")
-                enriched_card = await self.enrich_card(card)
-                embedding = await self.generate_embeddings(enriched_card)
-                embeddings[card.name] = embedding
-                
-                # Update card in list
-                idx = next(i for i, c in enumerate(self.cards) if c.name == card.name)
-                self.cards[idx] = enriched_card
-                
-            except Exception as e:
-                print(f"Error processing {card.name}: {str(e)}")
-                continue
+        await asyncio.gather(*[process_card(idx, card) for idx, card in enumerate(self.cards)])
             
         self._save_cards()
         self._save_embeddings(embeddings)
 
 async def main():
-    enricher = TarotEnricher()
-    await enricher.process_all_cards()
+    async with TarotEnricher() as enricher:
+        await enricher.process_all_cards()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,27 +1,55 @@
-from PyPDF2 import PdfReader
+from concurrent.futures import ProcessPoolExecutor
+from pypdf import PdfReader
 from typing import List, Dict, Optional
+import heapq
+import math
+import operator
 import os
 import pickle
 from pathlib import Path
 from tqdm import tqdm
-from voyageai import get_embedding
+from voyageai import get_embeddings
 from dotenv import load_dotenv
-from ..exceptions import EnrichmentError
+from ..embedding_cache import EmbeddingCache, lookup_cached, merge_fetched
+from tarotai.core.exceptions import EnrichmentError
 
 load_dotenv()
 
-def extract_pdf_content(pdf_path: str) -> List[Dict[str, str]]:
-    """Extract structured content from PDF"""
+EMBEDDING_MODEL = "voyage-2"
+# Maximum number of inputs Voyage accepts in one embeddings request
+EMBEDDING_BATCH_SIZE = 128
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[Optional[str]]:
+    """Extract the text of pages [start, end) in a worker process."""
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() for i in range(start, end)]
+
+def extract_pdf_content(pdf_path: str, max_workers: Optional[int] = None) -> List[Dict[str, str]]:
+    """Extract structured content from PDF.
+
+    Text extraction is pure-Python CPU work, so page ranges are split
+    across a process pool rather than threads.
+    """
     if not Path(pdf_path).exists():
         raise FileNotFoundError(f"PDF file not found at {pdf_path}")
     
     try:
-        reader = PdfReader(pdf_path)
-        sections = []
+        total_pages = len(PdfReader(pdf_path).pages)
+        workers = max(1, min(max_workers or os.cpu_count() or 1, total_pages))
+        # One contiguous range per task so each worker parses the file only a few times
+        chunk = -(-total_pages // (workers * 4)) or 1
+        ranges = [(start, min(start + chunk, total_pages)) for start in range(0, total_pages, chunk)]
         
         print(f"Processing {pdf_path}...")
-        for i, page in tqdm(enumerate(reader.pages), total=len(reader.pages)):
-            text = page.extract_text()
+        texts: List[Optional[str]] = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_page_range, pdf_path, start, end) for start, end in ranges]
+            # Collect in submission order so pages stay in sequence
+            for future in tqdm(futures, total=len(futures)):
+                texts.extend(future.result())
+        
+        sections = []
+        for i, text in enumerate(texts):
             if text:
                 sections.append({
                     "page": i + 1,
@@ -32,15 +60,21 @@ def extract_pdf_content(pdf_path: str) -> List[Dict[str, str]]:
                     }
                 })
         
-        print(f"Processed {len(sections)} sections from {len(reader.pages)} pages")
+        print(f"Processed {len(sections)} sections from {total_pages} pages")
         return sections
     except Exception as e:
         raise ValueError(f"Failed to extract PDF content: {str(e)}")
 
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length; a zero vector stays zero."""
+    norm = math.hypot(*vector)
+    return [value / norm for value in vector] if norm else [0.0] * len(vector)
+
 class GoldenDawnKnowledgeBase:
     """Knowledge base for Golden Dawn tarot interpretations."""
     
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, embedding_cache: Optional[EmbeddingCache] = None):
+        self.embedding_cache = embedding_cache or EmbeddingCache()
         cache_path = Path(pdf_path).with_suffix('.pkl')
         
         if cache_path.exists():
@@ -54,29 +88,57 @@ class GoldenDawnKnowledgeBase:
                 pickle.dump(self.sections, f)
                 
         self.embeddings = self._generate_embeddings()
+        # Unit-length section vectors, computed once so a query is just dot products
+        self._unit_vectors = [_normalize(item["embedding"]) for item in self.embeddings]
+        
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with EMBEDDING_MODEL in batched requests.
+
+        Texts already in the embedding cache are not sent again.
+        """
+        cached, missing_texts = lookup_cached(self.embedding_cache, EMBEDDING_MODEL, texts)
+        fetched: List[List[float]] = []
+        
+        if missing_texts:
+            voyage_key = os.getenv("VOYAGE_API_KEY")
+            if not voyage_key:
+                raise EnrichmentError("Voyage API key not found in environment variables.")
+            
+            for start in range(0, len(missing_texts), EMBEDDING_BATCH_SIZE):
+                fetched.extend(get_embeddings(
+                    missing_texts[start:start + EMBEDDING_BATCH_SIZE],
+                    model=EMBEDDING_MODEL,
+                    api_key=voyage_key
+                ))
         
+        return merge_fetched(self.embedding_cache, EMBEDDING_MODEL, texts, cached, missing_texts, fetched)
+
     def _generate_embeddings(self) -> List[Dict]:
         """Generate embeddings for all sections"""
-        embeddings = []
-        voyage_key = os.getenv("VOYAGE_API_KEY")
-        if not voyage_key:
-            raise EnrichmentError("Voyage API key not found in environment variables.")
-            
-        for section in self.sections:
-            embedding = get_embedding(
-                section['content'],
-                model="voyage-2",
-                api_key=voyage_key
-            )
-            embeddings.append({
+        vectors = self._embed_texts([section['content'] for section in self.sections])
+        return [
+            {
                 "content": section['content'],
                 "embedding": embedding,
                 "metadata": section['metadata']
-            })
-        return embeddings
+            }
+            for section, embedding in zip(self.sections, vectors)
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a search query with the same model as the sections.
+
+        Similarities are only meaningful between vectors from one model, so
+        queries for find_relevant_sections must come from here.
+        """
+        return self._embed_texts([text])[0]
 
     def find_relevant_sections(self, query_embedding: List[float], top_k: int = 3) -> List[Dict]:
         """Find most relevant sections using cosine similarity."""
-        # TODO: Implement proper vector similarity search
-        # For now return first few sections
-        return self.embeddings[:top_k]
+        query = _normalize(query_embedding)
+        if not any(query):
+            return self.embeddings[:top_k]
+        
+        scores = [sum(map(operator.mul, query, vector)) for vector in self._unit_vectors]
+        best = heapq.nlargest(top_k, range(len(scores)), key=scores.__getitem__)
+        return [self.embeddings[i] for i in best]
@@ -0,0 +1,27 @@
+import importlib.util
+import random
+from pathlib import Path
+
+BOOK_T_PATH = Path(__file__).parent.parent / "scripts" / "data_processing" / "bookT.py"
+spec = importlib.util.spec_from_file_location("bookT", BOOK_T_PATH)
+bookT = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bookT)
+
+def test_reorder_incomplete_shuffled_deck():
+    """Test that a shuffled deck with gaps keeps its cards and fills the gaps with placeholders"""
+    full_deck = bookT.reorder_cards([])
+    expected_names = [card["name"] for card in full_deck]
+
+    rng = random.Random(78)
+    deck = [dict(card, source="input") for card in full_deck]
+    rng.shuffle(deck)
+    removed = {deck.pop()["name"] for _ in range(10)}
+    # Major Arcana have no suit/number keys and must not fill pip slots
+    assert any(not card.get("suit") for card in deck)
+
+    ordered = bookT.reorder_cards(deck)
+
+    assert [card["name"] for card in ordered] == expected_names
+    for card in ordered:
+        if card.get("suit"):
+            assert (card.get("source") == "input") == (card["name"] not in removed)
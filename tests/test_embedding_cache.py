@@ -0,0 +1,43 @@
+from tarotai.extensions.enrichment.embedding_cache import EmbeddingCache
+
+def test_cache_round_trip(tmp_path):
+    """Test that stored embeddings are returned for the same model and text"""
+    cache = EmbeddingCache(tmp_path / "embeddings.db")
+    cache.put_many("voyage-01", ["upright", "reversed"], [[0.5, -1.0], [0.25, 2.0]])
+
+    assert cache.get_many("voyage-01", ["reversed", "missing", "upright"]) == [
+        [0.25, 2.0],
+        None,
+        [0.5, -1.0],
+    ]
+
+def test_cache_is_keyed_by_model(tmp_path):
+    """Test that a different model never hits another model's entries"""
+    cache = EmbeddingCache(tmp_path / "embeddings.db")
+    cache.put("voyage-01", "The Fool", [1.0, 0.0])
+
+    assert cache.get("voyage-01", "The Fool") == [1.0, 0.0]
+    assert cache.get("voyage-02", "The Fool") is None
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that the oldest unused entry is evicted past max_entries"""
+    cache = EmbeddingCache(tmp_path / "embeddings.db", max_entries=2)
+    cache.put("voyage-01", "The Fool", [1.0])
+    cache.put("voyage-01", "The Magician", [2.0])
+    cache.get("voyage-01", "The Fool")
+    cache.put("voyage-01", "The Empress", [3.0])
+
+    assert cache.get("voyage-01", "The Magician") is None
+    assert cache.get("voyage-01", "The Fool") == [1.0]
+    assert cache.get("voyage-01", "The Empress") == [3.0]
+
+def test_cache_eviction_follows_access_order(tmp_path):
+    """Test that eviction follows access order even for reads and writes made together"""
+    cache = EmbeddingCache(tmp_path / "embeddings.db", max_entries=3)
+    for name in ["The Fool", "The Magician", "The Empress"]:
+        cache.put("voyage-01", name, [1.0])
+    cache.get_many("voyage-01", ["The Fool", "The Magician"])
+    cache.put_many("voyage-01", ["The Emperor", "The Lovers"], [[2.0], [3.0]])
+
+    assert cache.get_many("voyage-01", ["The Empress", "The Fool"]) == [None, None]
+    assert cache.get("voyage-01", "The Magician") == [1.0]
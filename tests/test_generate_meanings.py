@@ -0,0 +1,121 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "generate_meanings.py"
+spec = importlib.util.spec_from_file_location("generate_meanings", SCRIPT_PATH)
+generate_meanings = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generate_meanings)
+
+class FakeAIClient:
+    """Records each prompt and answers with a fixed JSON result"""
+    def __init__(self, result):
+        self.result = result
+        self.prompts = []
+
+    async def json_prompt(self, prompt, system_prompt=None):
+        self.prompts.append(prompt)
+        return self.result
+
+def make_card(**fields):
+    card = {
+        "name": "The Fool",
+        "element": "AIR",
+        "keywords": [],
+        "astrological": "Uranus",
+        "kabbalistic": "Aleph",
+        "upright_meaning": "",
+        "reversed_meaning": ""
+    }
+    card.update(fields)
+    return card
+
+def test_is_valid_meaning():
+    """Test that only non-empty strings are accepted as meanings"""
+    assert generate_meanings.is_valid_meaning("New beginnings.")
+    assert not generate_meanings.is_valid_meaning("   ")
+    assert not generate_meanings.is_valid_meaning({"meaning": "New beginnings."})
+    assert not generate_meanings.is_valid_meaning(None)
+
+def test_generate_meanings_requests_only_missing_meanings():
+    """Test that the prompt asks only for missing meanings and carries the upright context"""
+    ai_client = FakeAIClient({"upright_meaning": "Ignored.", "reversed_meaning": "Recklessness."})
+    card = make_card(upright_meaning="New beginnings.")
+
+    card = asyncio.run(generate_meanings.generate_meanings(card, ai_client))
+
+    prompt = ai_client.prompts[0]
+    assert "- Upright meaning: New beginnings." in prompt
+    assert '"reversed_meaning"' in prompt
+    assert '"upright_meaning"' not in prompt
+    assert '"keywords"' not in prompt
+    assert card["upright_meaning"] == "New beginnings."
+    assert card["reversed_meaning"] == "Recklessness."
+    assert card["keywords"] == []
+
+def test_generate_meanings_drops_malformed_values():
+    """Test that non-string meanings are left missing for the next run"""
+    ai_client = FakeAIClient({
+        "upright_meaning": {"meaning": "New beginnings."},
+        "reversed_meaning": "Recklessness."
+    })
+    card = asyncio.run(generate_meanings.generate_meanings(make_card(), ai_client))
+
+    assert "Upright meaning:" not in ai_client.prompts[0]
+    assert card["upright_meaning"] == ""
+    assert card["reversed_meaning"] == "Recklessness."
+
+class SlowAIClient:
+    """Answers cards in reverse order of the given names, so completion order differs from input"""
+    def __init__(self, names):
+        self.delays = {name: 0.01 * (len(names) - i) for i, name in enumerate(names)}
+
+    async def json_prompt(self, prompt, system_prompt=None):
+        name = prompt.split("- Card: ", 1)[1].split("\n", 1)[0]
+        await asyncio.sleep(self.delays[name])
+        return {"upright_meaning": f"{name} upright", "reversed_meaning": f"{name} reversed"}
+
+class FakeVoyageClient:
+    async def generate_embeddings(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+def test_load_checkpoint_skips_partial_line(tmp_path):
+    """Test that a line cut short by an interruption is ignored"""
+    checkpoint = tmp_path / "cards.jsonl"
+    checkpoint.write_bytes(b'{"name": "The Fool"}\n{"name": "The Magi')
+
+    assert generate_meanings.load_checkpoint(checkpoint) == {"The Fool": {"name": "The Fool"}}
+
+def test_process_cards_checkpoints_embedded_cards_in_order(tmp_path):
+    """Test that results keep input order and the checkpoint holds embedded cards after a partial line"""
+    names = ["The Fool", "The Magician", "The High Priestess", "The Empress", "The Emperor"]
+    checkpoint = tmp_path / "cards.jsonl"
+    checkpoint.write_bytes(b'{"name": "The Fool", "upright_mea')
+
+    processed = asyncio.run(generate_meanings.process_cards(
+        [make_card(name=name) for name in names],
+        SlowAIClient(names),
+        FakeVoyageClient(),
+        checkpoint_file=checkpoint,
+        embedding_batch_size=2
+    ))
+
+    assert [card["name"] for card in processed] == names
+    saved = generate_meanings.load_checkpoint(checkpoint)
+    assert sorted(saved) == sorted(names)
+    for card in saved.values():
+        assert card["upright_meaning"] == f"{card['name']} upright"
+        assert card["embeddings"]["upright"] == [float(len(card["upright_meaning"])), 1.0]
+        assert card["embeddings"]["reversed"] == [float(len(card["reversed_meaning"])), 1.0]
+
+def test_resume_from_checkpoint_merges_saved_cards(tmp_path):
+    """Test that saved work is merged into the deck by card name"""
+    checkpoint = tmp_path / "cards.jsonl"
+    checkpoint.write_bytes(b'{"name": "The Fool", "upright_meaning": "Saved.", "embeddings": {"upright": [1.0]}}\n')
+    cards = [make_card(), make_card(name="The Magician")]
+
+    cards = generate_meanings.resume_from_checkpoint(cards, checkpoint)
+
+    assert cards[0]["upright_meaning"] == "Saved."
+    assert cards[0]["embeddings"] == {"upright": [1.0]}
+    assert cards[1] == make_card(name="The Magician")
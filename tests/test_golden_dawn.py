@@ -0,0 +1,62 @@
+import asyncio
+import pickle
+
+import pytest
+
+from tarotai.core.exceptions import EnrichmentError
+from tarotai.extensions.enrichment.embedding_cache import EmbeddingCache
+from tarotai.extensions.enrichment.knowledge import golden_dawn
+from tarotai.extensions.enrichment.knowledge.golden_dawn import EMBEDDING_MODEL, GoldenDawnKnowledgeBase
+
+SECTIONS = {
+    "Fire of Fire": [1.0, 0.0, 0.0],
+    "Water of Water": [0.0, 1.0, 0.0],
+    "Fire of Water": [0.75, 0.75, 0.0],
+    "Air of Earth": [-1.0, 0.0, 0.0],
+    "Blank page": [0.0, 0.0, 0.0],
+}
+
+def build_knowledge_base(tmp_path):
+    """Build a knowledge base from a cached section pickle and cached embeddings, with no PDF or API calls"""
+    sections = [
+        {"page": i + 1, "content": content, "metadata": {"source": "test"}}
+        for i, content in enumerate(SECTIONS)
+    ]
+    with open(tmp_path / "golden_dawn.pkl", "wb") as f:
+        pickle.dump(sections, f)
+    cache = EmbeddingCache(tmp_path / "embeddings.db")
+    cache.put_many(EMBEDDING_MODEL, list(SECTIONS), list(SECTIONS.values()))
+    return GoldenDawnKnowledgeBase(str(tmp_path / "golden_dawn.pdf"), embedding_cache=cache)
+
+def test_find_relevant_sections_ranks_by_cosine_similarity(tmp_path):
+    """Test that sections are ranked by direction, not magnitude or file order"""
+    knowledge_base = build_knowledge_base(tmp_path)
+
+    ranked = knowledge_base.find_relevant_sections([10.0, 1.0, 0.0], top_k=3)
+
+    assert [section["content"] for section in ranked] == ["Fire of Fire", "Fire of Water", "Water of Water"]
+
+def test_embed_query_uses_section_model(tmp_path):
+    """Test that queries are embedded with the same model as the sections"""
+    knowledge_base = build_knowledge_base(tmp_path)
+
+    assert knowledge_base.embed_query("Fire of Water") == [0.75, 0.75, 0.0]
+
+def test_embed_query_from_worker_thread(tmp_path):
+    """Test that the enricher can embed queries off the event loop"""
+    knowledge_base = build_knowledge_base(tmp_path)
+
+    embedding = asyncio.run(asyncio.to_thread(knowledge_base.embed_query, "Fire of Water"))
+
+    assert embedding == [0.75, 0.75, 0.0]
+
+def test_embed_query_rejects_short_response(tmp_path, monkeypatch):
+    """Test that a response with too few vectors raises EnrichmentError and caches nothing"""
+    knowledge_base = build_knowledge_base(tmp_path)
+    monkeypatch.setenv("VOYAGE_API_KEY", "test-key")
+    monkeypatch.setattr(golden_dawn, "get_embeddings", lambda texts, **kwargs: [[1.0, 0.0, 0.0]] * (len(texts) - 1))
+
+    with pytest.raises(EnrichmentError):
+        knowledge_base._embed_texts(["Earth of Air", "Water of Fire"])
+
+    assert knowledge_base.embedding_cache.get_many(EMBEDDING_MODEL, ["Earth of Air", "Water of Fire"]) == [None, None]
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from tarotai.core.exceptions import EnrichmentError
+from tarotai.extensions.enrichment.clients.voyage import VoyageClient
+from tarotai.extensions.enrichment.embedding_cache import EmbeddingCache
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"data": self._data}
+
+class FakeHTTPClient:
+    """Embeds each text as [length, first character code], returning results in reverse order"""
+    def __init__(self, drop_last=False):
+        self.requests = []
+        self.drop_last = drop_last
+
+    async def post(self, url, headers=None, json=None):
+        self.requests.append(json["input"])
+        data = [
+            {"index": i, "embedding": [float(len(text)), float(ord(text[0]))]}
+            for i, text in enumerate(json["input"])
+        ]
+        if self.drop_last:
+            data.pop()
+        return FakeResponse(data[::-1])
+
+def fake_embedding(text):
+    return [float(len(text)), float(ord(text[0]))]
+
+def test_generate_embeddings_batches_misses_in_input_order(tmp_path):
+    """Test that batched results are restored to input order, with duplicates and cache hits"""
+    cache = EmbeddingCache(tmp_path / "embeddings.db")
+    texts = ["Wands", "The Fool", "Cups", "Swords", "Wands", "Pentacles", "The Fool"]
+
+    async def run():
+        client = VoyageClient(api_key="test-key", cache=cache)
+        await client.http_client.aclose()
+        client.http_client = FakeHTTPClient()
+        cache.put(client.model, "The Fool", [0.5, 0.5])
+        return client, await client.generate_embeddings(texts, batch_size=2)
+
+    client, embeddings = asyncio.run(run())
+
+    assert embeddings == [
+        [0.5, 0.5] if text == "The Fool" else fake_embedding(text) for text in texts
+    ]
+    sent = [text for request in client.http_client.requests for text in request]
+    assert sorted(sent) == ["Cups", "Pentacles", "Swords", "Wands"]
+    assert all(len(request) <= 2 for request in client.http_client.requests)
+    assert cache.get_many(client.model, ["Cups", "Swords"]) == [fake_embedding("Cups"), fake_embedding("Swords")]
+
+def test_generate_embeddings_rejects_incomplete_response(tmp_path):
+    """Test that a response missing an index raises EnrichmentError and caches nothing"""
+    cache = EmbeddingCache(tmp_path / "embeddings.db")
+
+    async def run():
+        client = VoyageClient(api_key="test-key", cache=cache)
+        await client.http_client.aclose()
+        client.http_client = FakeHTTPClient(drop_last=True)
+        with pytest.raises(EnrichmentError):
+            await client.generate_embeddings(["Wands", "Cups"])
+        return client
+
+    client = asyncio.run(run())
+
+    assert cache.get_many(client.model, ["Wands", "Cups"]) == [None, None]